@@ -17,18 +17,19 @@ class InputPathChecker:
         results = []
         for batch_number, path in enumerate(value):
             current_batch = {"batch": batch_number + 1}
-            p = Path(path)
-            if p.exists():
-                if p.is_file():
+            if path.exists():
+                if path.is_file():
                     current_batch = {
                         **current_batch,
                         "input": {
                             "given": path,
-                            "resolved": [replace_conflicting_characters_in_filename(p)],
+                            "resolved": [
+                                replace_conflicting_characters_in_filename(path)
+                            ],
                         },
                     }
-                elif p.is_dir():
-                    files = files_in_dir(p)
+                elif path.is_dir():
+                    files = files_in_dir(path)
                     amount_of_files_in_directory = len(files)
                     if amount_of_files_in_directory == 0:
                         raise click.BadParameter("No files found in directory")
@@ -53,6 +54,9 @@ class InputPathChecker:
         return results
 
 
+_DEFAULT_INPUT_CHECKER = InputPathChecker()
+
+
 class OutputPathChecker:
     def __call__(self, ctx, param, value):
         if value is None:
@@ -61,8 +65,7 @@ class OutputPathChecker:
         amount_of_current_param_values = len(value)
         input_path = ctx.params.get("input_path")
         if input_path is None:
-            input_path_checker = InputPathChecker()
-            input_path = input_path_checker(ctx, param, ["./input"])
+            input_path = _DEFAULT_INPUT_CHECKER(ctx, param, [Path("./input")])
 
         amount_of_input_values = len(input_path)
 
@@ -79,29 +82,27 @@ class OutputPathChecker:
         if amount_of_input_values != amount_of_current_param_values:
             to_be_enumerated = value * amount_of_input_values
 
+        # A broadcast output value only needs to be checked on disk once.
+        checked_paths: set = set()
         results = []
         for batch_number, path in enumerate(to_be_enumerated):
-            current_batch = {"batch": batch_number + 1}
-            p = Path(path)
-            if p.suffix:
-                if not p.parent.is_dir():
-                    raise FileNotFoundError(
-                        f"The parent directory `{str(p.parent)}` "
-                        f"for output argument `{str(p)}` does not exist."
-                    )
-                else:
-                    current_batch = {
-                        **current_batch,
-                        "output": {"given": path, "resolved": p},
-                    }
-            else:
-                if not p.is_dir():
-                    p.mkdir()
-                current_batch = {
-                    **current_batch,
-                    "output": {"given": path, "resolved": p},
+            if path not in checked_paths:
+                if path.suffix:
+                    if not path.parent.is_dir():
+                        raise FileNotFoundError(
+                            f"The parent directory `{str(path.parent)}` "
+                            f"for output argument `{str(path)}` does not exist."
+                        )
+                elif not path.is_dir():
+                    path.mkdir()
+                checked_paths.add(path)
+
+            results.append(
+                {
+                    "batch": batch_number + 1,
+                    "output": {"given": path, "resolved": path},
                 }
-            results.append(current_batch)
+            )
 
         return results
 
@@ -114,8 +115,7 @@ class PresetPathChecker:
         amount_of_current_param_values = len(value)
         input_path = ctx.params.get("input_path")
         if input_path is None:
-            input_path_checker = InputPathChecker()
-            input_path = input_path_checker(ctx, param, ["./input"])
+            input_path = _DEFAULT_INPUT_CHECKER(ctx, param, [Path("./input")])
 
         amount_of_input_values = len(input_path)
 
@@ -138,10 +138,9 @@ class PresetPathChecker:
             current_batch: dict = {"batch": batch_number + 1}
             if path is None:
                 current_batch = {**current_batch, param.name: None}
-            elif Path(path).exists():
-                p = Path(path)
-                if p.is_file():
-                    current_batch = {**current_batch, param.name: read_json(p)}
+            elif path.exists():
+                if path.is_file():
+                    current_batch = {**current_batch, param.name: read_json(path)}
                 else:
                     raise click.BadParameter("Not a file")
             else:
@@ -156,8 +155,7 @@ class PresetOptionalChecker:
         amount_of_current_param_values = len(value)
         input_path = ctx.params.get("input_path")
         if input_path is None:
-            input_path_checker = InputPathChecker()
-            input_path = input_path_checker(ctx, param, ["./input"])
+            input_path = _DEFAULT_INPUT_CHECKER(ctx, param, [Path("./input")])
 
         amount_of_input_values = len(input_path)
 
@@ -180,10 +178,9 @@ class PresetOptionalChecker:
             current_batch: dict = {"batch": batch_number + 1}
             if path is None:
                 current_batch = {**current_batch, param.name: None}
-            elif Path(path).exists():
-                p = Path(path)
-                if p.is_file():
-                    current_batch = {**current_batch, param.name: read_json(p)}
+            elif path.exists():
+                if path.is_file():
+                    current_batch = {**current_batch, param.name: read_json(path)}
                 else:
                     raise click.BadParameter("Not a file")
             else:
@@ -203,14 +200,15 @@ class AutoAudioFlagChecker:
             "copy": "./preset/audio-copy.json",
         }
 
+        results = {}
         for key, file_path in audio_presets.items():
             p = Path(file_path)
             if not p.is_file():
-                continue
+                raise click.BadParameter(f"Audio preset `{file_path}` does not exist")
 
-            audio_presets[key] = read_json(p)  # type: ignore[assignment]
+            results[key] = read_json(p)
 
-        return audio_presets
+        return results
 
 
 class OptionalValueChecker:
@@ -221,8 +219,7 @@ class OptionalValueChecker:
         amount_of_current_param_values = len(value)
         input_path = ctx.params.get("input_path")
         if input_path is None:
-            input_path_checker = InputPathChecker()
-            input_path = input_path_checker(ctx, param, ["./input"])
+            input_path = _DEFAULT_INPUT_CHECKER(ctx, param, [Path("./input")])
 
         amount_of_input_values = len(input_path)
 
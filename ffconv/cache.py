@@ -0,0 +1,103 @@
+import json
+import os
+from pathlib import Path
+
+# Format version of the identified tracks cache; bump when the cached track format changes
+IDENTIFY_CACHE_VERSION = 1
+
+# Maximum number of entries kept on write, so entries of files that are never processed again can not pile up
+IDENTIFY_CACHE_MAX_ENTRIES = 10000
+
+
+def identify_cache_path() -> Path:
+    """
+    Returns the path of the file used to cache identified tracks between runs.
+
+    Raises:
+        RuntimeError: If `XDG_CACHE_HOME` is not set and the home directory can not be resolved.
+
+    Returns:
+        Path: The path to the cache file, located in `$XDG_CACHE_HOME/ffconv` (defaults to `~/.cache/ffconv`).
+    """
+
+    cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home().joinpath(".cache")
+
+    return Path(cache_home).joinpath("ffconv", "identify.json")
+
+
+def read_identify_cache() -> dict:
+    """
+    Reads the identified tracks cache.
+
+    Returns:
+        dict: The cached tracks by cache key, or an empty dictionary if the cache can not be read or was written
+            in another format version.
+    """
+
+    # Read without `read_json`, so the cache is not kept in its lru_cache after being loaded
+    try:
+        with identify_cache_path().open("r") as file:
+            data = json.load(file)
+    except (OSError, RuntimeError, ValueError):
+        return {}
+
+    if not isinstance(data, dict) or data.get("version") != IDENTIFY_CACHE_VERSION:
+        return {}
+
+    return data.get("tracks", {})
+
+
+def is_identify_cache_key_current(cache_key: str) -> bool:
+    """
+    Checks if the file of an identified tracks cache key still has the cached modification time and size.
+
+    Parameters:
+        cache_key (str): The cache key in the format `path|mtime_ns|size`.
+
+    Returns:
+        bool: True if the file is unchanged, False if it changed or no longer exists.
+    """
+
+    file_path, mtime_ns, size = cache_key.rsplit("|", 2)
+    try:
+        file_stat = os.stat(file_path)
+    except OSError:
+        return False
+
+    return f"{file_stat.st_mtime_ns}|{file_stat.st_size}" == f"{mtime_ns}|{size}"
+
+
+def write_identify_cache(cache: dict, input_files: set) -> None:
+    """
+    Writes the identified tracks cache, ignoring failures (e.g. read-only or unresolvable home directory).
+
+    Only entries of this run's input files are checked, and dropped if the file changed since it was identified;
+    entries of other files are kept without touching the disk. The oldest entries are dropped once the cache
+    exceeds `IDENTIFY_CACHE_MAX_ENTRIES`.
+
+    Parameters:
+        cache (dict): The cached tracks by cache key.
+        input_files (set): The paths of this run's input files, as used in the cache keys.
+
+    Returns:
+        None
+    """
+
+    tracks = {
+        cache_key: cache_tracks
+        for cache_key, cache_tracks in cache.items()
+        if cache_key.rsplit("|", 2)[0] not in input_files
+        or is_identify_cache_key_current(cache_key)
+    }
+
+    # Entries are ordered from read to newly identified, so the oldest are dropped first
+    if len(tracks) > IDENTIFY_CACHE_MAX_ENTRIES:
+        tracks = dict(list(tracks.items())[-IDENTIFY_CACHE_MAX_ENTRIES:])
+
+    try:
+        path = identify_cache_path()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("w") as file:
+            json.dump({"version": IDENTIFY_CACHE_VERSION, "tracks": tracks}, file)
+    except (OSError, RuntimeError):
+        pass
@@ -1,9 +1,13 @@
+import functools
 import json
+import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from itertools import repeat
 from pathlib import Path
 
 import click
-from rich.prompt import IntPrompt
 
 from ffconv.args import (
     InputPathChecker,
@@ -13,47 +17,45 @@ from ffconv.args import (
     PresetOptionalChecker,
     AutoAudioFlagChecker,
 )
-from ffconv.exception import StreamOrderError, StreamTypeMissingError
+from ffconv.cache import read_identify_cache, write_identify_cache
+from ffconv.exception import (
+    MatroskaParseError,
+    StreamOrderError,
+    StreamTypeMissingError,
+)
 from ffconv.helper import (
     split_list_of_dicts_by_key,
     combine_arguments_by_batch,
-    remove_empty_dict_values,
-    dict_to_list,
+    preset_to_args,
     preprocess_streams,
 )
+from ffconv.probe import matroska_tracks
 from ffconv.process import ProcessCommand
-from ffconv.table import table_print_stream_options
 from loguru import logger  # noqa
 
+# Identified tracks by `path|mtime_ns|size`, persisted between runs
+IDENTIFY_CACHE: dict = {}
 
-def validate_stream_order(mkvmerge_identify_result, file_details):
-    """
-    Check the stream order in the given mkvmerge result.
-
-    Parameters:
-        mkvmerge_identify_result (dict): A dictionary containing the mkvmerge result.
-            The keys are the stream types (e.g., 'video', 'audio', 'subtitles') and the values
-            are dictionaries with the following keys:
-            - 'count' (int): The number of streams of that type.
-        file_details (dict): A dictionary containing the file name and batch name.
+# Resolve the executables once instead of on every subprocess call
+MKVMERGE = shutil.which("mkvmerge") or "mkvmerge"
+FFMPEG = shutil.which("ffmpeg") or "ffmpeg"
 
-    Raises:
-        StreamOrderError: If the stream order does not follow convention video - audio - subtitles.
-    """
+# Static leading arguments of the commands
+MKVMERGE_IDENTIFY_ARGUMENTS = (
+    MKVMERGE,
+    "--identify",
+    "--identification-format",
+    "json",
+)
+FFMPEG_CONVERT_ARGUMENTS = (FFMPEG, "-hide_banner", "-loglevel", "error", "-y", "-i")
 
-    required_streams_order = ["video", "audio", "subtitles"]
-    for idx, (stream_type, stream_info) in enumerate(mkvmerge_identify_result.items()):
-        if required_streams_order[idx] == stream_type:
-            continue
+# Escapes backslashes and colons of the input path in the subtitles filter
+FILTER_PATH_ESCAPE_TABLE = str.maketrans({"\\": "\\\\", ":": "\\:"})
 
-        raise StreamOrderError(
-            required_streams_order[idx], idx, stream_type, file_details
-        )
 
-
-def validate_stream_count(mkvmerge_identify_result, file_details):
+def validate_streams(mkvmerge_identify_result, file_details):
     """
-    Validates the stream count in the given mkvmerge result.
+    Validates the stream types and stream order in the given mkvmerge result.
 
     Parameters:
         mkvmerge_identify_result (dict): A dictionary containing the mkvmerge result.
@@ -64,13 +66,37 @@ def validate_stream_count(mkvmerge_identify_result, file_details):
 
     Raises:
         StreamTypeMissingError: If a required stream type is missing in the mkvmerge result.
+        StreamOrderError: If the stream order does not follow convention video - audio - subtitles.
     """
 
-    required_streams_types = ["video", "audio", "subtitles"]
-    for required_stream_type in required_streams_types:
-        if required_stream_type in mkvmerge_identify_result:
-            continue
-        raise StreamTypeMissingError(required_stream_type, file_details)
+    # Stream IDs of each type must form one contiguous block, in the required order
+    required_streams_order = ["video", "audio", "subtitles"]
+    expected_stream_id = 0
+    for stream_type in required_streams_order:
+        stream_info = mkvmerge_identify_result.get(stream_type)
+        if stream_info is None or stream_info["count"] < 1:
+            raise StreamTypeMissingError(stream_type, file_details)
+
+        for stream in stream_info["streams"]:
+            if stream["id"] == expected_stream_id:
+                expected_stream_id += 1
+                continue
+
+            actual_stream_type = next(
+                (
+                    other_type
+                    for other_type, other_info in mkvmerge_identify_result.items()
+                    if any(
+                        other_stream["id"] == expected_stream_id
+                        for other_stream in other_info["streams"]
+                    )
+                ),
+                "n/a",
+            )
+
+            raise StreamOrderError(
+                stream_type, expected_stream_id, actual_stream_type, file_details
+            )
 
 
 def stream_user_input(mkvmerge_identify_result):
@@ -86,6 +112,7 @@ def stream_user_input(mkvmerge_identify_result):
                 Each stream dictionary has the following keys:
                 - 'id' (int): The ID of the stream.
                 - 'properties' (dict): A dictionary containing additional properties of the stream.
+            - 'by_id' (dict): The same streams keyed by their ID.
 
     Raises:
         StreamTypeMissingError: If any stream count is less than 1.
@@ -106,6 +133,11 @@ def stream_user_input(mkvmerge_identify_result):
                 "properties": stream_info["streams"][0]["properties"],
             }
         else:
+            # Rich is only needed to let the user choose between streams; importing it lazily keeps startup fast
+            from rich.prompt import IntPrompt
+
+            from ffconv.table import table_print_stream_options
+
             logger.info(f"Multiple `{stream_type}` streams detected")
 
             # Default
@@ -148,12 +180,10 @@ def stream_user_input(mkvmerge_identify_result):
             )
             logger.info(f"Selected stream index: {selected_stream}")
 
-            properties = {}
-            if stream_type == "audio":
-                preprocessed_streams = preprocess_streams(stream_info["streams"])
-                properties = preprocessed_streams.get(selected_stream)["properties"]
-
-            stream_map[stream_type] = {"id": selected_stream, "properties": properties}
+            stream_map[stream_type] = {
+                "id": selected_stream,
+                "properties": stream_info["by_id"][selected_stream]["properties"],
+            }
 
         # Remap subtitle due to filter complex
         if stream_type != "subtitles":
@@ -166,81 +196,148 @@ def stream_user_input(mkvmerge_identify_result):
     return stream_map
 
 
-def mkvmerge_identify_streams(
-    input_file,
-    total_items,
-    item_index,
-    batch_index,
-    batch_name,
-):
+def identify_tracks(input_file):
     """
-    Identify and parse the streams in an MKV file.
+    Identify the tracks in an MKV file.
+
+    The tracks are read directly from the Matroska structure of the file, falling back to MKVmerge identify if
+    the file can not be parsed.
 
     Parameters:
         input_file (Path): The path to the input MKV file.
-        total_items (int): The total number of items in the batch.
-        item_index (int): The index of the current item.
-        batch_index (int): The index of the batch.
-        batch_name (str): The name of the batch.
 
     Returns:
-        tuple: A tuple containing the parsed streams and the mapping.
-            - streams (dict): A dictionary containing the parsed streams.
-                The keys are the stream types (e.g., 'video', 'audio', 'subtitle') and the values
-                are dictionaries with the following keys:
-                - 'count' (int): The number of streams of that type.
-                - 'streams' (list): A list of dictionaries, each representing a stream.
-                    Each stream dictionary has the following keys:
-                    - 'id' (int): The ID of the stream.
-                    - 'properties' (dict): A dictionary containing additional properties of the stream.
-            - mapping (dict or None): The mapping for stream conversion, if applicable.
+        list: A list of dictionaries, each representing a track in the format of `mkvmerge --identify`.
     """
 
-    if item_index == 0:
-        logger.info(
-            f"MKVmerge identify batch `{batch_index}` for `{batch_name}` started."
-        )
+    try:
+        return matroska_tracks(input_file)
+    except MatroskaParseError as error:
+        logger.warning(f"{error} Falling back to MKVmerge identify.")
 
-    mkvmerge_identify_command = [
-        "mkvmerge",
-        "--identify",
-        "--identification-format",
-        "json",
-        str(input_file),
-    ]
+    mkvmerge_identify_command = [*MKVMERGE_IDENTIFY_ARGUMENTS, str(input_file)]
 
     process = ProcessCommand(logger)
     result = process.run("MKVmerge identify", mkvmerge_identify_command)
 
-    mkvmerge_identify_output = json.loads(result.stdout)
+    return json.loads(result.stdout)["tracks"]
 
-    # Split by codec_type
-    split_streams, split_keys = split_list_of_dicts_by_key(
-        mkvmerge_identify_output["tracks"], "type"
+
+def cached_identify_tracks(input_file: str, mtime_ns: int, size: int) -> list:
+    """
+    Identify the tracks in an MKV file, reusing earlier results for unchanged files.
+
+    Results are cached in `IDENTIFY_CACHE`, which is persisted between runs.
+
+    Parameters:
+        input_file (str): The path to the input MKV file.
+        mtime_ns (int): The modification time of the input file in nanoseconds.
+        size (int): The size of the input file in bytes.
+
+    Returns:
+        list: A list of dictionaries, each representing a track in the format of `mkvmerge --identify`.
+    """
+
+    cache_key = f"{input_file}|{mtime_ns}|{size}"
+    if cache_key not in IDENTIFY_CACHE:
+        IDENTIFY_CACHE[cache_key] = identify_tracks(Path(input_file))
+
+    return IDENTIFY_CACHE[cache_key]
+
+
+def mkvmerge_identify_streams(input_file, batch_name):
+    """
+    Identify and parse the streams in an MKV file.
+
+    Parameters:
+        input_file (Path): The path to the input MKV file.
+        batch_name (str): The name of the batch.
+
+    Returns:
+        dict: A dictionary containing the parsed streams.
+            The keys are the stream types (e.g., 'video', 'audio', 'subtitle') and the values
+            are dictionaries with the following keys:
+            - 'count' (int): The number of streams of that type.
+            - 'streams' (list): A list of dictionaries, each representing a stream.
+                Each stream dictionary has the following keys:
+                - 'id' (int): The ID of the stream.
+                - 'properties' (dict): A dictionary containing additional properties of the stream.
+            - 'by_id' (dict): The same streams keyed by their ID.
+    """
+
+    input_file_stat = input_file.stat()
+    tracks = cached_identify_tracks(
+        str(input_file), input_file_stat.st_mtime_ns, input_file_stat.st_size
     )
 
+    # Split by codec_type
+    split_streams, split_keys = split_list_of_dicts_by_key(tracks, "type")
+
     # Rebuild streams & count per codec type
-    streams = {k: {"streams": {}, "count": 0} for k in split_keys}
-    for x, s in enumerate(split_keys):
-        streams[s]["streams"] = split_streams[x]
-        streams[s]["count"] = len(streams[s]["streams"])
+    streams = {
+        stream_type: {
+            "streams": type_streams,
+            "by_id": preprocess_streams(type_streams),
+            "count": len(type_streams),
+        }
+        for stream_type, type_streams in zip(split_keys, split_streams)
+    }
 
     file_details = {"file_name": input_file, "batch_name": batch_name}
 
-    validate_stream_count(streams, file_details)
-    validate_stream_order(streams, file_details)
+    validate_streams(streams, file_details)
 
-    # Check if first file from batch for mapping in conversion later
-    mapping = None
-    if item_index == 0:
-        mapping = stream_user_input(streams)
+    return streams
 
-    if item_index == total_items - 1:
-        logger.info(
-            f"MKVmerge identify batch `{batch_index}` for `{batch_name}` completed."
+
+def mkvmerge_identify_many(input_files, batch_name):
+    """
+    Identify and parse the streams of all MKV files in a batch in parallel.
+
+    Parameters:
+        input_files (list): The paths to the input MKV files.
+        batch_name (str): The name of the batch.
+
+    Returns:
+        dict: A dictionary with the input file paths as keys and their parsed streams as values.
+    """
+
+    with ThreadPoolExecutor(
+        max_workers=min(len(input_files), os.cpu_count() or 1)
+    ) as executor:
+        results = executor.map(
+            mkvmerge_identify_streams, input_files, repeat(batch_name)
         )
 
-    return streams, mapping
+        return dict(zip(input_files, results))
+
+
+def ffmpeg_filter_complex_parts(stream_mapping, filter_preset):
+    """
+    Build the parts of the filter complex before and after the subtitles filter, which are the same for a batch.
+
+    Parameters:
+        stream_mapping (dict): The mapping for stream conversion.
+        filter_preset (dict): The filter preset.
+
+    Returns:
+        tuple: A tuple containing the filter complex prefix and suffix.
+    """
+
+    filter_complex_prefix = f"[0:{stream_mapping['video']['id']}]"
+    filter_complex_suffix = ""
+
+    # Additional filter complex options; added due to possible issues with subtitles using BT.709 color space
+    if filter_preset is not None:
+        filter_complex_data_before = filter_preset.get("before", "").strip()
+        if len(filter_complex_data_before):
+            filter_complex_prefix += filter_complex_data_before.rstrip(",") + ","
+
+        filter_complex_data_after = filter_preset.get("after", "").strip()
+        if len(filter_complex_data_after):
+            filter_complex_suffix = "," + filter_complex_data_after.lstrip(",")
+
+    return filter_complex_prefix, filter_complex_suffix
 
 
 def ffmpeg_convert_file(
@@ -248,14 +345,10 @@ def ffmpeg_convert_file(
     output_path: Path,
     output_extension: str,
     stream_mapping: dict,
-    video_preset: dict,
-    audio_preset: dict,
-    filter_preset: dict | None,
-    total_items: int,
-    item_index: int,
-    batch_index: int,
-    batch_name: str,
-    auto_audio_preset: bool | dict,
+    video_preset_list: list,
+    audio_preset_list: list,
+    filter_complex_prefix: str,
+    filter_complex_suffix: str,
 ):
     """
     Convert an input file to an output file using FFmpeg.
@@ -263,104 +356,85 @@ def ffmpeg_convert_file(
     Parameters:
         input_file (Path): The path to the input file.
         output_path (Path): The path to the output directory or file.
-        output_extension (str): The extension of the output file.
+        output_extension (str): The extension of the output file, including the leading dot.
         stream_mapping (dict): The mapping for stream conversion.
-        video_preset (dict): The video preset.
-        audio_preset (dict): The audio preset.
-        filter_preset (dict): The filter preset.
-        total_items (int): The total number of items in the batch.
-        item_index (int): The index of the current item.
-        batch_index (int): The index of the batch.
-        batch_name (str): The name of the batch.
-        auto_audio_preset (dict): Auto audio preset.
+        video_preset_list (list): The video preset arguments.
+        audio_preset_list (list): The audio preset arguments.
+        filter_complex_prefix (str): The filter complex up to the subtitles filter.
+        filter_complex_suffix (str): The filter complex after the subtitles filter.
     """
 
-    # Converting presets to lists and clearing empty values
-    video_preset_list = dict_to_list(remove_empty_dict_values(video_preset))
-    if isinstance(auto_audio_preset, dict):
-        audio_preset = auto_audio_preset["default"]
-        if stream_mapping["audio"]["properties"]["codec_id"] == "A_AAC":
-            audio_preset = auto_audio_preset["copy"]
-
-    audio_preset_list = dict_to_list(remove_empty_dict_values(audio_preset))
-
-    if item_index == 0:
-        logger.info(f"FFmpeg batch `{batch_index}` for `{batch_name}` started.")
-
-    output_extension_with_leading_dot = "." + output_extension.lstrip(".")
     if output_path.is_dir():
-        output_file = output_path.joinpath(
-            input_file.stem + output_extension_with_leading_dot
-        )
+        output_file = os.path.join(output_path, input_file.stem + output_extension)
     else:
-        output_file = Path(
-            f"{output_path.with_suffix('')}{output_extension_with_leading_dot}"
-        )
+        output_file_base, _ = os.path.splitext(output_path)
+        output_file = output_file_base + output_extension
 
-    # Prepare mapping data
-    video_map_index = "0:" + str(stream_mapping["video"]["id"])
     audio_map_index = "0:" + str(stream_mapping["audio"]["id"])
 
     # Filter complex subtitle map requires this escaped monstrosity for Windows
-    lit_file = str(input_file).replace("\\", "\\\\").replace(":", "\:")
-    filter_complex_map = (
-        "subtitles='" + lit_file + "':si=" + str(stream_mapping["subtitles"]["id"]),
+    input_file_str = str(input_file)
+    lit_file = input_file_str.translate(FILTER_PATH_ESCAPE_TABLE)
+    filter_complex_map_complete = (
+        f"{filter_complex_prefix}subtitles='{lit_file}'"
+        f":si={stream_mapping['subtitles']['id']}{filter_complex_suffix}"
     )
 
-    # Additional filter complex options; added due to possible issues with subtitles using BT.709 color space
-    if filter_preset is not None:
-        filter_complex_data_before = filter_preset.get("before", "")
-        if len(filter_complex_data_before.strip()):
-            filter_complex_map = (  # type: ignore[assignment]
-                filter_complex_data_before.strip().rstrip(","),
-                *filter_complex_map,
-            )
+    ffmpeg_convert_command = [
+        *FFMPEG_CONVERT_ARGUMENTS,
+        input_file_str,
+        "-metadata",
+        "title=" + input_file.stem,
+        "-metadata",
+        f'comment=Encoded on {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}',
+        "-map",
+        audio_map_index,
+        "-filter_complex",
+        filter_complex_map_complete,
+        *video_preset_list,
+        *audio_preset_list,
+        "-movflags",
+        "faststart",
+        output_file,
+    ]
 
-        filter_complex_data_after = filter_preset.get("after", "")
-        if len(filter_complex_data_after.strip()):
-            filter_complex_map = (  # type: ignore[assignment]
-                *filter_complex_map,
-                filter_complex_data_after.strip().lstrip(","),
-            )
+    process = ProcessCommand(logger)
+    # Only stderr is needed to report errors, the output itself is written to file
+    process.run("FFmpeg convert", ffmpeg_convert_command, capture_stdout=False)
 
-    filter_complex_map_concat = ",".join(filter_complex_map)
-    filter_complex_map_complete = f"[{video_map_index}]{filter_complex_map_concat}"
 
-    current_datetime = datetime.now()
-    metadata_encoded_date = (
-        f'comment=Encoded on {current_datetime.strftime("%Y-%m-%d %H:%M:%S")}'
-    )
+def ffmpeg_max_workers(
+    video_preset: dict, total_items: int, output_path: Path, jobs: int | None = None
+) -> int:
+    """
+    Determine the amount of FFmpeg conversions of a batch that can run in parallel.
 
-    ffmpeg_convert_command = (
-        [
-            "ffmpeg",
-            "-hide_banner",
-            "-loglevel",
-            "error",
-            "-y",
-            "-i",
-            str(input_file),
-            "-metadata",
-            "title=" + input_file.stem,
-            "-metadata",
-            metadata_encoded_date,
-            "-map",
-            audio_map_index,
-            "-filter_complex",
-            filter_complex_map_complete,
-        ]
-        + video_preset_list
-        + audio_preset_list
-        + ["-movflags", "faststart", str(output_file)]
-    )
+    FFmpeg already uses all available cores when the video preset does not limit `-threads`, in which case the
+    files are converted one at a time, unless the amount of jobs is given explicitly. A batch with an output file
+    instead of an output directory is always converted one file at a time.
 
-    process = ProcessCommand(logger)
-    process.run("FFmpeg convert", ffmpeg_convert_command)
+    Parameters:
+        video_preset (dict): The video preset.
+        total_items (int): The total number of items in the batch.
+        output_path (Path): The path to the output directory or file.
+        jobs (int, optional): The amount of parallel conversions requested by the user. Defaults to None.
+
+    Returns:
+        int: The maximum amount of parallel FFmpeg conversions.
+    """
 
-    if item_index != total_items - 1:
-        return
+    # With an output file instead of a directory, every file of the batch is written to that same path
+    if not output_path.is_dir():
+        return 1
 
-    logger.info(f"FFmpeg batch `{batch_index}` for `{batch_name}` completed.")
+    if jobs is not None:
+        return max(1, min(total_items, jobs))
+
+    ffmpeg_threads = str(video_preset.get("-threads", ""))
+    if not ffmpeg_threads.isdigit() or int(ffmpeg_threads) == 0:
+        return 1
+
+    return max(1, min(total_items, (os.cpu_count() or 1) // int(ffmpeg_threads)))
 
 
 @logger.catch
@@ -371,7 +445,9 @@ def ffmpeg_convert_file(
 @click.option(
     "--input-path",
     "-i",
-    type=click.Path(exists=True, dir_okay=True, file_okay=True, resolve_path=True),
+    type=click.Path(
+        exists=True, dir_okay=True, file_okay=True, resolve_path=True, path_type=Path
+    ),
     required=False,
     multiple=True,
     callback=InputPathChecker(),
@@ -382,7 +458,7 @@ def ffmpeg_convert_file(
 @click.option(
     "--output-path",
     "-o",
-    type=click.Path(dir_okay=True, file_okay=True, resolve_path=True),
+    type=click.Path(dir_okay=True, file_okay=True, resolve_path=True, path_type=Path),
     required=False,
     multiple=True,
     callback=OutputPathChecker(),
@@ -393,7 +469,9 @@ def ffmpeg_convert_file(
 @click.option(
     "--video-preset",
     "-vp",
-    type=click.Path(exists=True, dir_okay=False, file_okay=True, resolve_path=True),
+    type=click.Path(
+        exists=True, dir_okay=False, file_okay=True, resolve_path=True, path_type=Path
+    ),
     required=False,
     multiple=True,
     callback=PresetPathChecker(),
@@ -404,7 +482,9 @@ def ffmpeg_convert_file(
 @click.option(
     "--audio-preset",
     "-ap",
-    type=click.Path(exists=True, dir_okay=False, file_okay=True, resolve_path=True),
+    type=click.Path(
+        exists=True, dir_okay=False, file_okay=True, resolve_path=True, path_type=Path
+    ),
     required=False,
     multiple=True,
     callback=PresetPathChecker(),
@@ -415,7 +495,9 @@ def ffmpeg_convert_file(
 @click.option(
     "--filter-preset",
     "-fp",
-    type=click.Path(exists=True, dir_okay=False, file_okay=True, resolve_path=True),
+    type=click.Path(
+        exists=True, dir_okay=False, file_okay=True, resolve_path=True, path_type=Path
+    ),
     required=False,
     multiple=True,
     callback=PresetOptionalChecker(),
@@ -442,6 +524,14 @@ def ffmpeg_convert_file(
     callback=AutoAudioFlagChecker(),
     help="Automatically decides audio preset to use based on audio stream codec",
 )
+@click.option(
+    "--jobs",
+    "-j",
+    type=click.IntRange(min=1),
+    required=False,
+    default=None,
+    help="Amount of files to convert in parallel; derived from `-threads` in the video preset if not given",
+)
 def cli(
     input_path,
     output_path,
@@ -450,37 +540,51 @@ def cli(
     filter_preset,
     extension,
     auto_audio_preset,
+    jobs,
 ):
     # auto_decide_presets = auto
+    IDENTIFY_CACHE.update(read_identify_cache())
+
     combined_result = combine_arguments_by_batch(
         input_path, output_path, video_preset, audio_preset, filter_preset, extension
     )
 
-    # Identify streams
-    for item in combined_result:
-        current_batch = item.get("batch")
-        current_input_original_batch_name = item.get("input").get("given")
-        current_input_files = item.get("input").get("resolved")
-        total_current_input_files = len(current_input_files)
+    # Identify streams; the identified tracks are persisted even if a batch fails
+    try:
+        for item in combined_result:
+            current_batch = item.get("batch")
+            current_input_original_batch_name = item.get("input").get("given")
+            current_input_files = item.get("input").get("resolved")
 
-        stream_mapping = None
-        for current_file_path_index, current_file_path in enumerate(
-            current_input_files
-        ):
-            mkvmerge_identify_result, mapping = mkvmerge_identify_streams(
-                current_file_path,
-                total_current_input_files,
-                current_file_path_index,
-                current_batch,
-                current_input_original_batch_name,
+            logger.info(
+                f"MKVmerge identify batch `{current_batch}` for "
+                f"`{current_input_original_batch_name}` started."
             )
 
-            if mapping is None:
-                continue
+            identified_streams = mkvmerge_identify_many(
+                current_input_files, current_input_original_batch_name
+            )
 
-            stream_mapping = mapping
+            # Only the first file of the batch requests the stream mapping from the user
+            stream_mapping = stream_user_input(
+                identified_streams[current_input_files[0]]
+            )
 
-        item["stream_mapping"] = stream_mapping
+            logger.info(
+                f"MKVmerge identify batch `{current_batch}` for "
+                f"`{current_input_original_batch_name}` completed."
+            )
+
+            item["stream_mapping"] = stream_mapping
+    finally:
+        write_identify_cache(
+            IDENTIFY_CACHE,
+            {
+                str(input_file)
+                for item in combined_result
+                for input_file in item.get("input").get("resolved")
+            },
+        )
 
     # Convert
     for item in combined_result:
@@ -488,27 +592,56 @@ def cli(
         current_video_preset = item.get("video_preset")
         current_audio_preset = item.get("audio_preset")
         current_filter_preset = item.get("filter_preset")
-        current_output_extension = item.get("extension")
+        current_output_extension = "." + item.get("extension").lstrip(".")
         current_stream_mapping = item.get("stream_mapping")
         current_output = item.get("output").get("resolved")
         current_input_original_batch_name = item.get("input").get("given")
         current_input_files = item.get("input").get("resolved")
         total_current_input_files = len(current_input_files)
 
-        for current_file_path_index, current_file_path in enumerate(
-            current_input_files
-        ):
-            ffmpeg_convert_file(
-                current_file_path,
-                current_output,
-                current_output_extension,
-                current_stream_mapping,
+        logger.info(
+            f"FFmpeg batch `{current_batch}` for "
+            f"`{current_input_original_batch_name}` started."
+        )
+
+        # Presets and metadata are the same for every file in the batch
+        if isinstance(auto_audio_preset, dict):
+            current_audio_preset = auto_audio_preset["default"]
+            if current_stream_mapping["audio"]["properties"]["codec_id"] == "A_AAC":
+                current_audio_preset = auto_audio_preset["copy"]
+
+        current_video_preset_list = preset_to_args(current_video_preset)
+        current_audio_preset_list = preset_to_args(current_audio_preset)
+
+        current_filter_complex_prefix, current_filter_complex_suffix = (
+            ffmpeg_filter_complex_parts(current_stream_mapping, current_filter_preset)
+        )
+
+        with ThreadPoolExecutor(
+            max_workers=ffmpeg_max_workers(
                 current_video_preset,
-                current_audio_preset,
-                current_filter_preset,
                 total_current_input_files,
-                current_file_path_index,
-                current_batch,
-                current_input_original_batch_name,
-                auto_audio_preset,
+                current_output,
+                jobs,
             )
+        ) as executor:
+            list(
+                executor.map(
+                    functools.partial(
+                        ffmpeg_convert_file,
+                        output_path=current_output,
+                        output_extension=current_output_extension,
+                        stream_mapping=current_stream_mapping,
+                        video_preset_list=current_video_preset_list,
+                        audio_preset_list=current_audio_preset_list,
+                        filter_complex_prefix=current_filter_complex_prefix,
+                        filter_complex_suffix=current_filter_complex_suffix,
+                    ),
+                    current_input_files,
+                )
+            )
+
+        logger.info(
+            f"FFmpeg batch `{current_batch}` for "
+            f"`{current_input_original_batch_name}` completed."
+        )
@@ -130,3 +130,29 @@ class StreamTypeMissingError(Exception):
 
     def __str__(self):
         return self.message
+
+
+class MatroskaParseError(Exception):
+    """
+    Custom exception class for Matroska parsing related errors.
+
+    This exception is raised when the tracks can not be read directly from the Matroska structure of a file.
+
+    Attributes:
+        message (str): The error message associated with the failure.
+
+    Args:
+        message (str): The error message associated with the failure.
+        file_name (Path): The path of the file that could not be parsed.
+    """
+
+    ERROR_MESSAGE = "Unable to read Matroska tracks for file `{file_name}`: {message}."
+
+    def __init__(self, message, file_name):
+        self.message = self.ERROR_MESSAGE.format(
+            message=message, file_name=str(file_name)
+        )
+        super().__init__(self.message)
+
+    def __str__(self):
+        return self.message
@@ -1,81 +1,114 @@
 import collections
 import fnmatch
 import functools
+import itertools
 import json
+import os
 import re
 from pathlib import Path
 
+# Quotes in filenames break the FFmpeg subtitles filter
+CONFLICTING_CHARACTERS_PATTERN = re.compile(r"[\"']")
 
-def files_in_dir(path: Path, file_types=["*.mkv"]):
+
+def iter_files_in_dir(path: Path, file_types=("*.mkv",)):
+    """
+    Yields the files in the given directory that match the specified file types.
+
+    Parameters:
+        path (Path): The path to the directory.
+        file_types (Tuple[str], optional): The file types to match. Defaults to ("*.mkv",).
+
+    Yields:
+        Path: A path to a file in the directory that matches the specified file types.
+    """
+
+    # An empty alternation would match every file
+    if not file_types:
+        return
+
+    # All file types are matched at once by a single case-insensitive pattern
+    file_types_pattern = re.compile(
+        "|".join(fnmatch.translate(file_type) for file_type in file_types),
+        re.IGNORECASE,
+    )
+
+    # `os.walk` uses `os.scandir`, which tells files from directories without an additional stat per entry
+    for directory, _, file_names in os.walk(path):
+        for file_name in file_names:
+            if file_types_pattern.match(file_name):
+                yield Path(directory, file_name)
+
+
+def files_in_dir(path: Path, file_types=("*.mkv",)):
     """
     Returns a list of files in the given directory that match the specified file types.
 
     Parameters:
         path (Path): The path to the directory.
-        file_types (List[str], optional): A list of file types to match. Defaults to ["*.mkv"].
+        file_types (Tuple[str], optional): The file types to match. Defaults to ("*.mkv",).
 
     Returns:
         List[Path]: A list of paths to the files in the directory that match the specified file types.
     """
 
-    file_list = [
-        f
-        for f in path.rglob("*")
-        if any(
-            fnmatch.fnmatch(f.name.lower(), pattern.lower()) for pattern in file_types
-        )
-    ]
-
-    return file_list
+    return list(iter_files_in_dir(path, file_types))
 
 
-def read_json(path: Path) -> dict:
+@functools.lru_cache(maxsize=128)
+def _read_json_cached(path: str, mtime_ns: int) -> dict:
     """
-    Reads a JSON file from the given path and returns its contents as a dictionary.
+    Reads a JSON file, caching the contents by path and modification time.
 
     Parameters:
-        path (Path): The path to the JSON file.
+        path (str): The path to the JSON file.
+        mtime_ns (int): The modification time of the JSON file in nanoseconds, part of the cache key.
 
     Returns:
         dict: The contents of the JSON file as a dictionary.
     """
 
-    with path.open("r") as file:
+    with open(path, "r") as file:
         data = json.load(file)
 
     return data
 
 
-def remove_empty_dict_values(input_dict: dict) -> dict:
+def read_json(path: Path) -> dict:
     """
-    Removes empty values from a dictionary.
+    Reads a JSON file from the given path and returns its contents as a dictionary.
+
+    The contents are cached by path and modification time, so a preset used for multiple batches is only read
+    once. The returned dictionary is shared between callers and should not be modified.
 
     Parameters:
-        input_dict (dict): The dictionary to remove empty values from.
+        path (Path): The path to the JSON file.
 
     Returns:
-        dict: The input dictionary with empty values removed.
+        dict: The contents of the JSON file as a dictionary.
     """
 
-    cleared_data = {k: v for k, v in input_dict.items() if v}
-
-    return cleared_data
+    return _read_json_cached(str(path), path.stat().st_mtime_ns)
 
 
-def dict_to_list(key_value_dict: dict) -> list:
+def preset_to_args(preset: dict) -> list:
     """
-    Convert a dictionary to a list by concatenating its key-value pairs.
+    Convert a preset to a list of command arguments, skipping options with empty values.
 
     Parameters:
-        key_value_dict (dict): The dictionary to be converted to a list.
+        preset (dict): The preset with options as keys and their values.
 
     Returns:
-        list: A list containing the concatenated key-value pairs from the input dictionary.
+        list: A list containing the option and value pairs of the non-empty options.
     """
 
-    key_value_list = list(functools.reduce(lambda x, y: x + y, key_value_dict.items()))  # type: ignore
+    preset_args = []
+    for option, value in preset.items():
+        if value:
+            preset_args.append(option)
+            preset_args.append(value)
 
-    return key_value_list
+    return preset_args
 
 
 def split_list_of_dicts_by_key(
@@ -94,14 +127,12 @@ def split_list_of_dicts_by_key(
 
     """
 
+    # Dictionaries preserve insertion order, so the keys are in order of first occurrence
     result = collections.defaultdict(list)
-    keys = []
     for d in list_of_dicts:
         result[d[key]].append(d)
-        if d[key] not in keys:
-            keys.append(d[key])
 
-    return list(result.values()), keys
+    return list(result.values()), list(result.keys())
 
 
 def replace_conflicting_characters_in_filename(file_path: Path) -> Path:
@@ -115,7 +146,10 @@ def replace_conflicting_characters_in_filename(file_path: Path) -> Path:
         Path: The new file path after replacing conflicting characters.
     """
 
-    new_filename = re.sub(r"[\"']", "", file_path.name)
+    new_filename = CONFLICTING_CHARACTERS_PATTERN.sub("", file_path.name)
+    if new_filename == file_path.name:
+        return file_path
+
     new_file_path = file_path.with_name(new_filename)
     file_path.rename(new_file_path)
 
@@ -133,16 +167,11 @@ def combine_arguments_by_batch(*lists):
         list: A list of dictionaries containing combined items grouped by their 'batch' key.
     """
 
-    combined = collections.defaultdict(dict)
-
-    for lst in lists:
-        for item in lst:
-            batch = item["batch"]
-            combined[batch].update(item)
-
-    result = [value for key, value in combined.items()]
+    combined: dict = {}
+    for item in itertools.chain.from_iterable(lists):
+        combined.setdefault(item["batch"], {}).update(item)
 
-    return result
+    return list(combined.values())
 
 
 def preprocess_streams(streams_list):
@@ -0,0 +1,271 @@
+import os
+from pathlib import Path
+
+from ffconv.exception import MatroskaParseError
+
+EBML_HEADER_ID = 0x1A45DFA3
+SEGMENT_ID = 0x18538067
+TRACKS_ID = 0x1654AE6B
+TRACK_ENTRY_ID = 0xAE
+TRACK_NUMBER_ID = 0xD7
+TRACK_TYPE_ID = 0x83
+CODEC_ID_ID = 0x86
+LANGUAGE_ID = 0x22B59C
+LANGUAGE_IETF_ID = 0x22B59D
+NAME_ID = 0x536E
+FLAG_DEFAULT_ID = 0x88
+
+# Matroska track types as reported by `mkvmerge --identify`
+TRACK_TYPES = {1: "video", 2: "audio", 17: "subtitles", 18: "buttons"}
+
+
+def _vint_length(data: bytes, offset: int, max_length: int) -> int:
+    """
+    Get the length in bytes of the EBML variable size integer starting at the given offset.
+
+    Parameters:
+        data (bytes): The data containing the variable size integer.
+        offset (int): The offset of the first byte of the variable size integer.
+        max_length (int): The maximum allowed length in bytes.
+
+    Raises:
+        ValueError: If the data is truncated or the length marker is invalid.
+
+    Returns:
+        int: The length of the variable size integer in bytes.
+    """
+
+    if offset >= len(data):
+        raise ValueError("Unexpected end of data")
+
+    for length in range(1, max_length + 1):
+        if data[offset] & (0x80 >> (length - 1)):
+            if offset + length > len(data):
+                raise ValueError("Unexpected end of data")
+
+            return length
+
+    raise ValueError(f"Invalid variable size integer at offset `{offset}`")
+
+
+def _read_element_header(data: bytes, offset: int = 0) -> tuple[int, int | None, int]:
+    """
+    Read the ID and data size of the EBML element starting at the given offset.
+
+    Parameters:
+        data (bytes): The data containing the element.
+        offset (int, optional): The offset of the element. Defaults to 0.
+
+    Returns:
+        tuple: A tuple containing the element ID, the data size (None if unknown) and the offset of the element data.
+    """
+
+    id_length = _vint_length(data, offset, 4)
+    element_id = int.from_bytes(data[offset : offset + id_length], "big")
+    offset += id_length
+
+    size_length = _vint_length(data, offset, 8)
+    size_mask = (1 << (7 * size_length)) - 1
+    size = int.from_bytes(data[offset : offset + size_length], "big") & size_mask
+    offset += size_length
+
+    return element_id, None if size == size_mask else size, offset
+
+
+def _iterate_elements(data: bytes):
+    """
+    Iterate the child elements of a master element.
+
+    Parameters:
+        data (bytes): The data of the master element.
+
+    Raises:
+        ValueError: If a child element has an unknown or invalid size.
+
+    Yields:
+        tuple: A tuple containing the element ID and the element data.
+    """
+
+    offset = 0
+    while offset < len(data):
+        element_id, size, offset = _read_element_header(data, offset)
+        if size is None or offset + size > len(data):
+            raise ValueError(f"Invalid size for element `{element_id:#x}`")
+
+        yield element_id, data[offset : offset + size]
+        offset += size
+
+
+def _read_string(data: bytes) -> str:
+    """
+    Decode an EBML string element, which may be padded with null bytes.
+
+    Parameters:
+        data (bytes): The data of the string element.
+
+    Returns:
+        str: The decoded string.
+    """
+
+    return data.rstrip(b"\x00").decode("utf-8")
+
+
+def _read_unsigned_integer(data: bytes) -> int:
+    """
+    Decode an EBML unsigned integer element.
+
+    Parameters:
+        data (bytes): The data of the unsigned integer element.
+
+    Returns:
+        int: The decoded integer.
+    """
+
+    return int.from_bytes(data, "big")
+
+
+def _read_flag(data: bytes) -> bool:
+    """
+    Decode an EBML flag element, which is an unsigned integer of either 0 or 1.
+
+    Parameters:
+        data (bytes): The data of the flag element.
+
+    Returns:
+        bool: The decoded flag.
+    """
+
+    return bool(_read_unsigned_integer(data))
+
+
+# TrackEntry child elements by ID, with the `mkvmerge --identify` property name and the decoder of the value
+TRACK_ENTRY_PROPERTIES = {
+    TRACK_NUMBER_ID: ("number", _read_unsigned_integer),
+    CODEC_ID_ID: ("codec_id", _read_string),
+    LANGUAGE_ID: ("language", _read_string),
+    LANGUAGE_IETF_ID: ("language_ietf", _read_string),
+    NAME_ID: ("track_name", _read_string),
+    FLAG_DEFAULT_ID: ("default_track", _read_flag),
+}
+
+
+def _parse_track_entry(data: bytes, track_id: int) -> dict:
+    """
+    Parse a TrackEntry element into the track format of `mkvmerge --identify`.
+
+    Parameters:
+        data (bytes): The data of the TrackEntry element.
+        track_id (int): The mkvmerge track ID, which is the position of the track in the file.
+
+    Raises:
+        ValueError: If the track type is missing or not supported.
+
+    Returns:
+        dict: A dictionary with the keys 'id', 'type' and 'properties'.
+    """
+
+    track_type = None
+    properties: dict = {"language": "eng", "default_track": True}
+    for element_id, element_data in _iterate_elements(data):
+        if element_id == TRACK_TYPE_ID:
+            track_type = _read_unsigned_integer(element_data)
+        elif element_id in TRACK_ENTRY_PROPERTIES:
+            property_name, read_value = TRACK_ENTRY_PROPERTIES[element_id]
+            properties[property_name] = read_value(element_data)
+
+    if track_type not in TRACK_TYPES:
+        raise ValueError(f"Unsupported track type `{track_type}`")
+
+    if "codec_id" not in properties:
+        raise ValueError(f"Missing codec ID for track `{track_id}`")
+
+    return {"id": track_id, "type": TRACK_TYPES[track_type], "properties": properties}
+
+
+def _read_tracks_element(file) -> bytes:
+    """
+    Find the Tracks element of a Matroska file by skipping over the other top level elements of the segment.
+
+    Parameters:
+        file (BinaryIO): The opened Matroska file.
+
+    Raises:
+        ValueError: If the file is not a Matroska file or the Tracks element can not be found.
+
+    Returns:
+        bytes: The data of the Tracks element.
+    """
+
+    file_size = os.fstat(file.fileno()).st_size
+
+    # Element ID (4 bytes) and data size (8 bytes) are at most 12 bytes
+    element_id, size, offset = _read_element_header(file.read(12))
+    if element_id != EBML_HEADER_ID or size is None:
+        raise ValueError("Missing EBML header")
+
+    position = file.seek(offset + size)
+    element_id, segment_size, offset = _read_element_header(file.read(12))
+    if element_id != SEGMENT_ID:
+        raise ValueError("Missing segment")
+
+    position += offset
+    segment_end = None if segment_size is None else position + segment_size
+    while segment_end is None or position < segment_end:
+        file.seek(position)
+        header = file.read(12)
+        if not header:
+            break
+
+        element_id, size, offset = _read_element_header(header)
+        if size is None:
+            raise ValueError(f"Unknown size for element `{element_id:#x}`")
+
+        if element_id == TRACKS_ID:
+            # Check the size against the file before reading, as a corrupt size could exhaust memory
+            if size > file_size - (position + offset):
+                raise ValueError("Tracks size exceeds the file size")
+
+            file.seek(position + offset)
+            data = file.read(size)
+            if len(data) != size:
+                raise ValueError("Unexpected end of file")
+
+            return data
+
+        position += offset + size
+
+    raise ValueError("Missing tracks")
+
+
+def matroska_tracks(input_file: Path) -> list:
+    """
+    Read the tracks of a Matroska file directly from its Tracks element.
+
+    This avoids spawning `mkvmerge --identify` for every file, while returning the tracks in the same format.
+
+    Parameters:
+        input_file (Path): The path to the input MKV file.
+
+    Raises:
+        MatroskaParseError: If the tracks can not be read from the file.
+
+    Returns:
+        list: A list of dictionaries, each representing a track with the keys 'id', 'type' and 'properties'.
+    """
+
+    try:
+        with input_file.open("rb") as file:
+            tracks_data = _read_tracks_element(file)
+
+        track_entries = [
+            element_data
+            for element_id, element_data in _iterate_elements(tracks_data)
+            if element_id == TRACK_ENTRY_ID
+        ]
+
+        return [
+            _parse_track_entry(track_entry, track_id)
+            for track_id, track_entry in enumerate(track_entries)
+        ]
+    except (OSError, ValueError) as error:
+        raise MatroskaParseError(str(error), input_file) from error
@@ -1,4 +1,5 @@
 import subprocess as sp
+from pathlib import Path
 
 from ffconv.exception import MKVmergeError, ProcessError, FFmpegError
 
@@ -22,13 +23,14 @@ class ProcessCommand:
             "custom": ProcessError,
         }
 
-    def run(self, process, command):
+    def run(self, process, command, capture_stdout=True):
         """
         Runs the specified process with the given command.
 
         Args:
             process (str): The name of the process being executed.
             command (List[str]): The command to be executed.
+            capture_stdout (bool, optional): Whether to capture stdout; otherwise it is discarded. Defaults to True.
 
         Returns:
             CompletedProcess: The result of the command execution.
@@ -43,17 +45,26 @@ class ProcessCommand:
             f"The following {process} command will be executed: {' '.join(command)}"
         )
 
-        response = sp.run(command, stdout=sp.PIPE, stderr=sp.PIPE)
+        # Without `close_fds` and with an absolute executable path, CPython launches the process with
+        # `posix_spawn` instead of fork + exec. File descriptors are non-inheritable by default (PEP 446).
+        response = sp.run(
+            command,
+            stdout=sp.PIPE if capture_stdout else sp.DEVNULL,
+            stderr=sp.PIPE,
+            close_fds=False,
+        )
         return_code = response.returncode
         if return_code == 0:
             self.logger.info(f"{process} completed.")
 
             return response
 
-        if command[0] not in self.process_exceptions:
+        # The executable may be a full path, e.g. as resolved by `shutil.which`
+        executable = Path(command[0]).stem.lower()
+        if executable not in self.process_exceptions:
             exception = self.process_exceptions["custom"]
         else:
-            exception = self.process_exceptions[command[0]]
+            exception = self.process_exceptions[executable]
 
         self.logger.critical(response)
         raise exception(